@@ -1,56 +1,177 @@
-import csv
-import datetime
-import decimal
+import heapq
+import itertools
 import math
+import operator
+import os
 import re
 import sys
 import numpy as np
 import pandas as pd
 import pdfkit
 from jinja2 import Environment, FileSystemLoader
+import matplotlib
+matplotlib.use('Agg')
 from matplotlib import pyplot as plt
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import NamedStyle, Font, Border, Side
 from openpyxl.styles.numbers import BUILTIN_FORMATS
 from openpyxl.utils import get_column_letter
-from prettytable import prettytable
 import doctest
 import unittest
-from datetime import datetime
-import dateutil
-from dateutil.parser import *
 import multiprocessing
 from concurrent.futures import ProcessPoolExecutor
 
+_TAG_RE = re.compile(r'<[^>]*>')
+_WS_RE = re.compile(r'[^\S\n]+')
+_LINE_EDGES_RE = re.compile(r' ?\n ?')
+
 
 class DataSet:
-    """Класс для работы с входными данными"""
+    """Класс для работы с входными данными
 
-    def csv_parse(self, file_name):
+    Attributes:
+        filters (dict): Условия фильтрации неочищенных вакансий по названию поля. Условие получает функцию,
+            возвращающую очищенный столбец по его имени, и значение фильтра, а возвращает маску строк
+        chunk_size (int): Количество строк файла, считываемых за один раз
+    """
+    chunk_size = 100000
+    filters = {
+        'Название': lambda column, value: column('name').str.contains(value, regex=False),
+        'Описание': lambda column, value: column('description') == value,
+        'Навыки': lambda column, value: column('key_skills').str.split('\n').map(set(value.split(', ')).issubset),
+        'Опыт работы': lambda column, value:
+            column('experience_id').str.lower().map(Vacancy.value_to_rus['experience_id']) == value,
+        'Премиум-вакансия': lambda column, value:
+            column('premium').str.lower().map(Vacancy.value_to_rus['premium']) == value,
+        'Компания': lambda column, value: column('employer_name') == value,
+        'Оклад': lambda column, value:
+            (column('salary_from').astype(np.float64).astype(np.int64) <= int(value)) &
+            (int(value) <= column('salary_to').astype(np.float64).astype(np.int64)),
+        'Идентификатор валюты оклада': lambda column, value:
+            column('salary_currency').str.lower().map(Salary.currency_to_ru) == value,
+        'Название региона': lambda column, value: column('area_name') == value,
+        'Дата публикации вакансии': lambda column, value:
+            column('published_at').str[:10] == '-'.join(reversed(value.split('.'))),
+    }
+
+    def csv_parse(self, file_name, predicate=None):
         """Считывает ваканси с файла, формирует их список
 
+        Вакансии, не прошедшие фильтр, отбрасываются до очистки значений и создания объектов Vacancy
+
         Args:
             file_name (str): Название файла для чтения
+            predicate (function): Условие фильтрации из DataSet.filters с подставленным значением,
+                None - без фильтрации
 
         Returns:
             list: Список вакансий
         """
-        with open(file_name, 'r', encoding="utf-8-sig") as csvfile:
-            reader = csv.DictReader(csvfile)
-            vacancies = []
-            for vacancy in reader:
-                if len(vacancy) == len(reader.fieldnames) and not any(
-                        value is None or value == '' for value in vacancy.values()):
-                    vacancy_with_correct_value = self.get_correct_vacancy(vacancy)
-                    vacancies.append(Vacancy(vacancy_with_correct_value))
-            if reader.fieldnames is None or len(vacancies) == 0:
-                if reader.fieldnames is None:
-                    print('Пустой файл')
-                else:
-                    print('Нет данных')
-                sys.exit()
-
-        return vacancies
+        data = self.read_csv(file_name, predicate)
+        fieldnames = tuple(data.columns)
+        columns = [self.get_correct_column(data[key]).tolist() for key in fieldnames]
+        return [Vacancy(dict(zip(fieldnames, values))) for values in zip(*columns)]
+
+    def csv_parse_frame(self, file_name):
+        """Считывает вакансии с файла в таблицу, по одному столбцу на поле
+
+        Args:
+            file_name (str): Название файла для чтения
+
+        Returns:
+            DataFrame: Вакансии со столбцами salary_avg_rub - средней зарплатой в рублях и year - годом публикации
+        """
+        return self.get_stats_frame(self.read_csv(file_name))
+
+    def iter_csv_frames(self, file_name):
+        """Считывает вакансии с файла по частям, не загружая весь файл в память
+
+        Args:
+            file_name (str): Название файла для чтения
+
+        Returns:
+            generator: Таблицы вакансий по chunk_size строк в формате csv_parse_frame
+        """
+        for chunk in self.read_csv_chunks(file_name):
+            yield self.get_stats_frame(chunk)
+
+    def get_stats_frame(self, data):
+        """Очищает таблицу вакансий и добавляет в нее столбцы для статистики
+
+        Args:
+            data (DataFrame): Неочищенные вакансии
+
+        Returns:
+            DataFrame: Вакансии со столбцами salary_avg_rub - средней зарплатой в рублях и year - годом публикации
+        """
+        for key in data.columns:
+            data[key] = self.get_correct_column(data[key])
+        data['salary_from'] = data['salary_from'].astype(np.float64).astype(np.int64)
+        data['salary_to'] = data['salary_to'].astype(np.float64).astype(np.int64)
+        data['currency_index'] = data['salary_currency'].str.upper().map(_CURRENCY_INDEX).astype(np.int8)
+        rate = _CURRENCY_RATES[data['currency_index'].to_numpy()]
+        data['salary_avg_rub'] = (data['salary_from'] * rate + data['salary_to'] * rate) / 2
+        data['year'] = data['published_at'].str[:4].astype(np.int16)
+        return data
+
+    def read_csv(self, file_name, predicate=None):
+        """Считывает файл с вакансиями частями по chunk_size строк, отбрасывает неполные строки и строки,
+        не прошедшие фильтр, так что в памяти остаются только подходящие вакансии
+
+        Args:
+            file_name (str): Название файла для чтения
+            predicate (function): Условие фильтрации, None - без фильтрации
+
+        Returns:
+            DataFrame: Неочищенные вакансии
+        """
+        return pd.concat(list(self.read_csv_chunks(file_name, predicate)))
+
+    def read_csv_chunks(self, file_name, predicate=None):
+        """Считывает файл с вакансиями частями по chunk_size строк, отбрасывая неполные строки и строки,
+        не прошедшие фильтр
+
+        Args:
+            file_name (str): Название файла для чтения
+            predicate (function): Условие фильтрации, None - без фильтрации
+
+        Returns:
+            generator: Неочищенные вакансии по частям
+        """
+        has_data = False
+        # пустой файл нельзя отобразить в память, для него read_csv сам сообщит об отсутствии данных
+        memory_map = os.path.getsize(file_name) != 0
+        try:
+            with pd.read_csv(file_name, encoding='utf-8-sig', dtype=str, keep_default_na=False,
+                             on_bad_lines='skip', memory_map=memory_map, chunksize=self.chunk_size) as reader:
+                for chunk in reader:
+                    complete = np.ones(len(chunk), dtype=bool)
+                    for key in chunk.columns:
+                        complete &= (chunk[key].notna() & (chunk[key] != '')).to_numpy()
+                    chunk = chunk[complete]
+                    has_data = has_data or len(chunk) != 0
+                    if predicate is not None:
+                        chunk = chunk[predicate(lambda key: self.get_correct_column(chunk[key]))]
+                    yield chunk
+        except pd.errors.EmptyDataError:
+            print('Пустой файл')
+            sys.exit()
+        if not has_data:
+            print('Нет данных')
+            sys.exit()
+
+    def get_correct_column(self, column):
+        """Удаляет лишние пробелы и html теги из всех значений столбца
+
+        Args:
+            column (Series): Столбец со строками
+
+        Returns:
+            Series: Очищенный столбец
+        """
+        get_correct_string = self.get_correct_string
+        return pd.Series([get_correct_string(value) for value in column], index=column.index, dtype=object)
 
     def get_correct_vacancy(self, vacancy):
         """Удаляет лишние символы из вакансии
@@ -61,23 +182,19 @@ class DataSet:
         Returns:
             dict: Вакансия с корректными значениями
         """
+        return {key: self.get_correct_string(vacancy[key]) for key in vacancy}
 
-        def get_correct_string(s):
-            """Удаляет лишние пробелы и html теги из строки
+    def get_correct_string(self, s):
+        """Удаляет лишние пробелы и html теги из строки
 
-            Args:
-                s (str): Строка
-
-            Returns:
-                str: Очищенная строка
-            """
-            s = re.sub(r'<[^>]*>', '', s)
-            result = []
-            for item in s.split('\n'):
-                result.append(' '.join(item.split()))
-            return '\n'.join(result)
+        Args:
+            s (str): Строка
 
-        return {key: get_correct_string(vacancy[key]) for key in vacancy}
+        Returns:
+            str: Очищенная строка
+        """
+        s = _WS_RE.sub(' ', _TAG_RE.sub('', s))
+        return _LINE_EDGES_RE.sub('\n', s).strip(' ')
 
 
 class DataSetTests(unittest.TestCase):
@@ -89,19 +206,36 @@ class DataSetTests(unittest.TestCase):
         vacancy = Vacancy(DataSet().get_correct_vacancy(
             {"name": "Программист <html><T>", "area_name": "Омск    ", "published_at": "2007-12-03T17:34:36+0300",
              "salary_from": " <br>100   ", "salary_to": "10000   ",
-             "salary_currency": "RUR    <bobofds>"})).__dict__
+             "salary_currency": "RUR    <bobofds>"}))
         expected_vacancy = Vacancy(
             {"name": "Программист", "area_name": "Омск", "published_at": "2007-12-03T17:34:36+0300",
              "salary_from": "100", "salary_to": "10000",
-             "salary_currency": "RUR"}).__dict__
-        for key in vacancy:
+             "salary_currency": "RUR"})
+        for key in Vacancy.__slots__:
             if key == 'salary':
-                salary = vacancy[key].__dict__
-                expected_salary = expected_vacancy[key].__dict__
-                for salary_key in salary:
-                    self.assertEqual(expected_salary[salary_key], salary[salary_key])
+                for salary_key in Salary.__slots__:
+                    self.assertEqual(getattr(expected_vacancy.salary, salary_key, None),
+                                     getattr(vacancy.salary, salary_key, None))
             else:
-                self.assertEqual(expected_vacancy[key], vacancy[key])
+                self.assertEqual(getattr(expected_vacancy, key, None), getattr(vacancy, key, None))
+
+    def test_filters(self):
+        data = pd.DataFrame(
+            {"name": ["Главный программист", "Аналитик <b>данных</b>"], "description": ["Описание", "Описание"],
+             "key_skills": ["Git\nPython", "SQL"], "experience_id": ["between1And3", "noExperience"],
+             "premium": ["True", "False"], "employer_name": ["ООО Компания", "ООО Компания"],
+             "salary_from": ["100.5", "50"], "salary_to": ["200", "99.9"], "salary_gross": ["True", "False"],
+             "salary_currency": ["RUR", "EUR"], "area_name": ["Омск", "Москва  "],
+             "published_at": ["2007-12-03T17:34:36+0300", "2022-07-05T18:21:28+0300"]})
+        vacancies = [Vacancy(DataSet().get_correct_vacancy(row)) for row in data.to_dict('records')]
+        for key, value in [("Название", "программист"), ("Навыки", "Python, Git"), ("Опыт работы", "Нет опыта"),
+                           ("Премиум-вакансия", "Да"), ("Оклад", "100"), ("Оклад", "99"),
+                           ("Идентификатор валюты оклада", "Евро"), ("Название региона", "Москва"),
+                           ("Дата публикации вакансии", "05.07.2022")]:
+            mask = DataSet.filters[key](lambda column: DataSet().get_correct_column(data[column]), value)
+            self.assertEqual([v.is_suitable(key, value) for v in vacancies], list(mask), (key, value))
+        mask = DataSet.filters["Оклад"](lambda column: DataSet().get_correct_column(data[column]), "100")
+        self.assertEqual([True, False], list(mask))
 
 
 class Vacancy:
@@ -113,11 +247,14 @@ class Vacancy:
         salary (Salary): Зарплата
         area_name (str): Город, в котором была размещена вакансия
         published_at (str): Время, в которое была создана вакансия
-        key_skills (str): Ключевые навыки
+        key_skills (tuple): Ключевые навыки
         experience_id (str): Опыт, который должны иметь кандидаты
         premium (str): Является ли вакансия премиумной
         employer_name (str): Название кампании, разместившей вакансию
     """
+    __slots__ = ('name', 'description', 'salary', 'area_name', 'published_at', 'key_skills', 'experience_id',
+                 'premium', 'employer_name', '_published_date', '_salary_sort', '_skill_set', '_skills_joined',
+                 '_skills_count', '_experience_rank', '_experience_ru', '_premium_ru')
 
     def __init__(self, data):
         """Инициализирует объект Salary
@@ -129,24 +266,59 @@ class Vacancy:
         if data is None:
             return
         self.name = data['name']
-        self.salary = Salary({key: data[key] for key in data if 'salary' in key}, 'description' in data)
+        self.salary = Salary(data, 'description' in data)
         self.area_name = data['area_name']
         self.published_at = data['published_at']
+        self._published_date = self.parse_date(self.published_at)
+        self._salary_sort = self.salary.get_salary_in_rub()
         if 'description' in data:
             self.description = data['description']
-            self.key_skills = data['key_skills'].split('\n')
+            self.key_skills = tuple(data['key_skills'].split('\n'))
             self.experience_id = data['experience_id']
             self.premium = data['premium']
             self.employer_name = data['employer_name']
+            self._skill_set = frozenset(self.key_skills)
+            self._skills_joined = data['key_skills']
+            self._skills_count = len(self.key_skills)
+            self._experience_rank = _EXPERIENCE_INDEX[self.experience_id.lower()]
+            self._experience_ru = _EXPERIENCE_RU[self._experience_rank]
+            self._premium_ru = self.value_to_rus['premium'][self.premium.lower()]
 
     value_to_rus = {'premium': {'false': 'Нет', 'true': 'Да'},
                     'experience_id': {'noexperience': 'Нет опыта', 'between1and3': 'От 1 года до 3 лет',
                                       'between3and6': 'От 3 до 6 лет', 'morethan6': 'Более 6 лет', }}
-    naming_to_en = {'Название': 'name', 'Описание': 'descriprion', 'Навыки': 'key_skills',
+    naming_to_en = {'Название': 'name', 'Описание': 'description', 'Навыки': 'key_skills',
                     'Опыт работы': 'experience_id',
                     'Премиум-вакансия': 'premium', 'Компания': 'employer_name',
                     'Оклад': 'salary', 'Идентификатор валюты оклада': 'salary_currency',
                     'Название региона': 'area_name', 'Дата публикации вакансии': 'published_at', }
+    sort_keys = {'Название': operator.attrgetter('name'), 'Описание': operator.attrgetter('description'),
+                 'Навыки': operator.attrgetter('_skills_count'), 'Опыт работы': operator.attrgetter('_experience_rank'),
+                 'Премиум-вакансия': operator.attrgetter('premium'), 'Компания': operator.attrgetter('employer_name'),
+                 'Оклад': operator.attrgetter('_salary_sort'),
+                 'Идентификатор валюты оклада': lambda v: _CURRENCY_RU[v.salary.currency_index],
+                 'Название региона': operator.attrgetter('area_name'),
+                 'Дата публикации вакансии': operator.attrgetter('published_at'), }
+    suitability_checks = {'Название': lambda v, value: value in v.name,
+                          'Описание': lambda v, value: v.description == value,
+                          'Навыки': lambda v, value: set(value.split(', ')).issubset(v._skill_set),
+                          'Опыт работы': lambda v, value: v._experience_ru == value,
+                          'Премиум-вакансия': lambda v, value: v._premium_ru == value,
+                          'Компания': lambda v, value: v.employer_name == value,
+                          'Оклад': lambda v, value: v.salary.is_suitable('salary', value),
+                          'Идентификатор валюты оклада':
+                              lambda v, value: v.salary.is_suitable('salary_currency', value),
+                          'Название региона': lambda v, value: v.area_name == value,
+                          'Дата публикации вакансии': lambda v, value: v._published_date == value, }
+    formatters = (('name', operator.attrgetter('name'), True),
+                  ('description', operator.attrgetter('description'), True),
+                  ('key_skills', operator.attrgetter('_skills_joined'), True),
+                  ('experience_id', operator.attrgetter('_experience_ru'), False),
+                  ('premium', operator.attrgetter('_premium_ru'), False),
+                  ('employer_name', operator.attrgetter('employer_name'), True),
+                  ('salary', lambda v: v.salary.get_formatted_value(), True),
+                  ('area_name', operator.attrgetter('area_name'), True),
+                  ('published_at', operator.attrgetter('_published_date'), False), )
 
     def is_suitable(self, key, value, year_only=False):
         """Проверяет, удовлетворяет ли вакансия заданому условию
@@ -158,19 +330,9 @@ class Vacancy:
 
         Returns:
             bool: Удовлетворяет ли вакансия заданому условию"""
-        key = self.naming_to_en[key]
-        if key == 'name':
-            return value in self.name
-        if key == 'published_at':
-            if year_only:
-                return value == self.published_at.split('-')[0]
-            return value == self.parse_date(self.published_at)
-        elif key == 'salary' or key == 'salary_currency':
-            return self.salary.is_suitable(key, value)
-        self_value = self.__getattribute__(key)
-        if key in self.value_to_rus:
-            self_value = self.value_to_rus[key][self_value.lower()]
-        return self_value == value
+        if year_only and key == 'Дата публикации вакансии':
+            return value == self.published_at[:4]
+        return self.suitability_checks[key](self, value)
 
     def get_value_for_sort(self, key):
         """Подбирает значение для сортировки
@@ -180,36 +342,29 @@ class Vacancy:
         Returns:
             str, int: Значение для сравнения
         """
-        key = self.naming_to_en[key]
-        if 'salary' in key:
-            return self.salary.get_value_for_sort(key)
-        elif key == 'key_skills':
-            return len(self.key_skills)
-        elif key == 'experience_id':
-            d = {'noexperience': 0, 'between1and3': 1, 'between3and6': 2, 'morethan6': 3}
-            return d[self.experience_id.lower()]
-        else:
-            return self.__getattribute__(key)
+        return self.sort_keys[key](self)
 
-    def get_formatted_value(self):
-        """Генерирует значение в специальном формате при помощи словаря - value_to_rus
+    def get_formatted_value(self, fields=None):
+        """Генерирует значение в специальном формате при помощи кортежа - formatters
+
+        Args:
+            fields (frozenset): Названия полей на английском, которые будут выведены, None - все поля
 
         Returns:
-            list: Список атрибутов класса в форматном выводе"""
-        f_value = [self.name,
-                   self.description,
-                   '\n'.join(self.key_skills),
-                   self.value_to_rus['experience_id'][self.experience_id.lower()],
-                   self.value_to_rus['premium'][self.premium.lower()],
-                   self.employer_name,
-                   self.salary.get_formatted_value(),
-                   self.area_name,
-                   self.parse_date(self.published_at)]
-
-        for i, value in enumerate(f_value):
-            if len(value) > 100:
-                f_value[i] = value[:100] + '...'
-        return f_value
+            list: Список атрибутов класса в форматном выводе, невыводимые поля - пустые строки"""
+        return [(self.cut_value(get(self)) if may_be_long else get(self)) if fields is None or key in fields else ''
+                for key, get, may_be_long in self.formatters]
+
+    def cut_value(self, value):
+        """Обрезает строку до 100 символов, добавляя '...'
+
+        Args:
+            value (str): Строка
+
+        Returns:
+            str: Строка не длиннее 103 символов
+        """
+        return value if len(value) <= 100 else f'{value[:100]}...'
 
     def parse_date(self, s):
         """Извлекает дату из строки, содержащей дату и время
@@ -230,9 +385,7 @@ class Vacancy:
         """
         if s is None or ('T' not in s and '-' not in s.split('T')):
             return ""
-        time = s.split('T')[0].split('-')
-        time.reverse()
-        return '.'.join(time)
+        return f'{s[8:10]}.{s[5:7]}.{s[:4]}'
 
     # def parse_date(self, s):
     #     """Извлекает дату из строки, содержащей дату и время
@@ -275,6 +428,16 @@ class VacancyTests(unittest.TestCase):
         self.assertEqual(True, vacancy.is_suitable("Идентификатор валюты оклада", "Рубли"))
         self.assertEqual(False, vacancy.is_suitable("Идентификатор валюты оклада", "Евро"))
 
+    def test_is_suitable_key_skills(self):
+        vacancy = Vacancy(
+            {"name": "Программист", "description": "Описание", "key_skills": "Python\nSQL\nGit",
+             "experience_id": "noExperience", "premium": "False", "employer_name": "Компания",
+             "salary_from": "100", "salary_to": "10000", "salary_gross": "True", "salary_currency": "RUR",
+             "area_name": "Омск", "published_at": "2007-12-03T17:34:36+0300"})
+        self.assertEqual(True, vacancy.is_suitable("Навыки", "Python"))
+        self.assertEqual(True, vacancy.is_suitable("Навыки", "Git, Python"))
+        self.assertEqual(False, vacancy.is_suitable("Навыки", "Python, Java"))
+
     def test_get_value_for_sort(self):
         vacancy = Vacancy(
             {"name": "Главный программист", "area_name": "Омск", "published_at": "2007-12-03T17:34:36+0300",
@@ -287,6 +450,33 @@ class VacancyTests(unittest.TestCase):
                          vacancy.get_value_for_sort("Оклад"))
         self.assertEqual("Рубли", vacancy.get_value_for_sort("Идентификатор валюты оклада"))
 
+    def test_get_formatted_value_cuts_area(self):
+        vacancy = Vacancy(
+            {"name": "Программист", "area_name": "О" * 150, "published_at": "2007-12-03T17:34:36+0300",
+             "salary_from": "100", "salary_to": "10000", "salary_currency": "RUR"})
+        self.assertEqual(f'{"О" * 100}...', vacancy.get_formatted_value(frozenset(['area_name']))[7])
+
+    def test_sort_vacancies_limit(self):
+        for key in ("Название", "Оклад"):
+            vacancies = [Vacancy({"name": name, "area_name": "Омск", "published_at": "2007-12-03T17:34:36+0300",
+                                  "salary_from": salary, "salary_to": salary, "salary_currency": "RUR"})
+                         for name, salary in (("Б", "300"), ("А", "100"), ("В", "200"))]
+            Helpers().sort_vacancies(vacancies, key, False, -1)
+            self.assertEqual([], vacancies)
+
+    def test_sort_vacancies_limit_is_prefix(self):
+        vacancies = [Vacancy({"name": name, "area_name": "Омск", "published_at": "2007-12-03T17:34:36+0300",
+                              "salary_from": salary, "salary_to": salary, "salary_currency": currency})
+                     for name, salary, currency in (("Б", "300", "RUR"), ("А", "100", "RUR"), ("Б", "200", "RUR"),
+                                                    ("В", "100", "RUR"), ("А", "300", "RUR"), ("Г", "5", "EUR"))]
+        for key in ("Название", "Оклад"):
+            for reverse in (False, True):
+                expected = sorted(vacancies, key=Vacancy.sort_keys[key], reverse=reverse)
+                for limit in range(len(vacancies) + 1):
+                    limited = list(vacancies)
+                    Helpers().sort_vacancies(limited, key, reverse, limit)
+                    self.assertEqual([id(v) for v in expected[:limit]], [id(v) for v in limited], (key, reverse, limit))
+
 
 class Salary:
     """Класс для представления зарплаты
@@ -296,7 +486,11 @@ class Salary:
         salary_to (int): Верхняя граница вилки оклада
         salary_currency (str): Индификатор валюты оклада оклада
         salary_gross (str): Показывает, учитывается ли налог
+        currency_index (int): Номер валюты в таблицах _CURRENCY_*
+        gross_index (int): Номер значения salary_gross в таблице _GROSS_RU
     """
+    __slots__ = ('salary_from', 'salary_to', 'salary_currency', 'salary_gross', 'currency_index', 'gross_index')
+
     currency_to_rub = {"AZN": 35.68, "BYR": 23.91, "EUR": 59.90, "GEL": 21.74, "KGS": 0.76, "KZT": 0.13, "RUR": 1,
                        "UAH": 1.64, "USD": 60.66, "UZS": 0.0055, }
 
@@ -310,14 +504,16 @@ class Salary:
         """Инициализирует объект Salary
 
         Args:
-            dic (dict): Словарь с данными
+            dic (dict): Словарь с данными, из которого берутся только поля salary_*
             is_for_table (bool): Показывает, используется ли класс для создания таблицы
         """
-        self.salary_from = dic['salary_from']
-        self.salary_to = dic['salary_to']
+        self.salary_from = int(float(dic['salary_from']))
+        self.salary_to = int(float(dic['salary_to']))
         self.salary_currency = dic['salary_currency']
+        self.currency_index = _CURRENCY_INDEX[self.salary_currency.upper()]
         if is_for_table:
             self.salary_gross = dic['salary_gross']
+            self.gross_index = _GROSS_INDEX[self.salary_gross.lower()]
 
     def is_suitable(self, key, value):
         """Проверяет, удовлетворяет ли зарплата заданому условию
@@ -335,10 +531,9 @@ class Salary:
         'Salary'
         """
         if key == 'salary':
-            return int(self.salary_from) <= int(value) <= int(
-                self.salary_to)
+            return self.salary_from <= int(value) <= self.salary_to
         else:
-            return self.currency_to_ru[self.salary_currency.lower()] == value
+            return _CURRENCY_RU[self.currency_index] == value
 
     def get_value_for_sort(self, key):
         """Подбирает значение для сортировки
@@ -351,16 +546,20 @@ class Salary:
         if key == "salary":
             return self.get_salary_in_rub()
         elif key == "salary_currency":
-            return self.currency_to_ru[self.salary_currency.lower()]
+            return _CURRENCY_RU[self.currency_index]
         return ""
 
     def get_salary_in_rub(self):
-        """Вычисляет среднюю зарплату из вилки и переводит в рубли, при помощи словаря - currency_to_rub
+        """Вычисляет среднюю зарплату из вилки и переводит в рубли, при помощи таблицы курсов _CURRENCY_RATES
 
         Returns:
-            int: Зарплата в рублях"""
-        rate = self.currency_to_rub[self.salary_currency]
-        return (int(self.salary_from.split('.')[0]) * rate + int(self.salary_to.split('.')[0]) * rate) / 2
+            float: Зарплата в рублях
+
+        >>> Salary(dict(salary_from='100', salary_to='200.0', salary_currency="usd"), False).get_salary_in_rub()
+        9099.0
+        """
+        rate = _CURRENCY_RATES[self.currency_index]
+        return float((self.salary_from * rate + self.salary_to * rate) / 2)
 
     def get_formatted_value(self):
         """Генерирует значение в специальном формате при помощи словарей - currency_to_rub, gross_to_ru
@@ -369,8 +568,8 @@ class Salary:
             str: атрибуты класса в форматном выводе
         """
         salary = f'{self.get_formatted_salary(self.salary_from)} - {self.get_formatted_salary(self.salary_to)}'
-        currency = f'({self.currency_to_ru[self.salary_currency.lower()]})'
-        gross = f'({self.gross_to_ru[self.salary_gross.lower()]})'
+        currency = f'({_CURRENCY_RU[self.currency_index]})'
+        gross = f'({_GROSS_RU[self.gross_index]})'
         return f'{salary} {currency} {gross}'
 
     def get_formatted_salary(self, salary):
@@ -381,10 +580,23 @@ class Salary:
 
         Returns:
 
-            str: зарплата в специальном формате"""
-        n = decimal.Decimal(salary)
-        res = '{0:,}'.format(n).replace(',', ' ')
-        return res.split('.')[0]
+            str: зарплата в специальном формате
+
+        >>> Salary(dict(salary_from='0', salary_to='0', salary_currency="RUR"), False).get_formatted_salary(1234567)
+        '1 234 567'
+        """
+        return f'{salary:,}'.replace(',', ' ')
+
+
+_CURRENCY_CODES = tuple(Salary.currency_to_rub)
+_CURRENCY_INDEX = {code: i for i, code in enumerate(_CURRENCY_CODES)}
+_CURRENCY_RATES = np.array([Salary.currency_to_rub[code] for code in _CURRENCY_CODES], dtype=np.float64)
+_CURRENCY_RU = tuple(Salary.currency_to_ru[code.lower()] for code in _CURRENCY_CODES)
+# Порядок опыта работы в value_to_rus задает и порядок сортировки по нему
+_EXPERIENCE_INDEX = {experience_id: i for i, experience_id in enumerate(Vacancy.value_to_rus['experience_id'])}
+_EXPERIENCE_RU = tuple(Vacancy.value_to_rus['experience_id'].values())
+_GROSS_INDEX = {gross: i for i, gross in enumerate(Salary.gross_to_ru)}
+_GROSS_RU = tuple(Salary.gross_to_ru.values())
 
 
 class InputConnect:
@@ -394,6 +606,7 @@ class InputConnect:
         need_filter (bool): Показывает, нужна ли фильтрация
         key_filter (str): Ключ, по которому будет производиться фильтрация
         value_filter (str): Значение, по которому будет производиться фильтрация
+        predicate (function): Условие фильтрации из DataSet.filters с подставленным значением фильтра
         need_sort (bool): Показывает, нужна ли сортировка
         key_sort (str): Ключ, по которому будет производиться сортировка
         start (int): Номер первой вакансии в таблице
@@ -405,6 +618,7 @@ class InputConnect:
         """Инициализирует объект InputConnect"""
         self.need_filter = False
         self.key_filter, self.value_filter = '', ''
+        self.predicate = None
         self.key_sort = ''
         self.need_sort, self.sort_reverse = False, False
         self.start = 1
@@ -432,6 +646,9 @@ class InputConnect:
             self.start, self.end = map(int, numbers)
         elif len(numbers) == 1:
             self.start = int(numbers[0])
+        if self.start < 1 or self.end is not None and self.end < 1:
+            print('Диапазон вывода задан некорректно')
+            sys.exit()
 
     def pars_filter(self, param_filter):
         """Парсит параметр фильтрации таблицы
@@ -451,6 +668,8 @@ class InputConnect:
             sys.exit()
         self.need_filter = True
         self.key_filter, self.value_filter = key_filter, value_filter
+        condition = DataSet.filters[key_filter]
+        self.predicate = lambda column: condition(column, value_filter)
 
     def pars_sort(self, param_sort, param_reverse):
         """Парсит параметры сортировки таблицы
@@ -481,11 +700,12 @@ class InputConnect:
             fields (list): Данные, которые будут в таблице
         """
         table = self.config_table()
-        for i, v in enumerate(fields):
-            table.add_row([i + 1] + v.get_formatted_value())
         if self.end is None:
             self.end = len(fields) + 1
-        print(table.get_string(start=self.start - 1, end=self.end - 1, fields=['№'] + self.naming))
+        start, end = self.start - 1, self.end - 1
+        naming_en = frozenset(Vacancy.naming_to_en[name] for name in self.naming)
+        table.add_rows([[i] + v.get_formatted_value(naming_en) for i, v in enumerate(fields[start:end], start + 1)])
+        print(table.get_string(fields=['№'] + self.naming))
 
     def config_table(self):
         """Конфигурирует таблицу
@@ -493,6 +713,7 @@ class InputConnect:
         Returns:
             Возвращает сконфигурированную таблицу
         """
+        from prettytable import prettytable
         table = prettytable.PrettyTable()
         table.hrules = prettytable.ALL
         table.field_names = ['№'] + self.all_fields
@@ -529,7 +750,7 @@ class DataStats:
         """Формирует статистики по годам и по городам
 
         Args:
-            vacancies (list): Вакансии для формирования статистики
+            vacancies (DataFrame): Вакансии для формирования статистики
             directory (str): Директория, в которой содержаться csv файлы с вакансиями
             prof_name (str): Название Профессии для формирования статистики
 
@@ -537,35 +758,43 @@ class DataStats:
             dict: Словарь со татистикой
         """
         self.prof_name = prof_name
-        for i in range(2007, 2023):
-            fields = self.filter_vacancies(vacancies, 'Дата публикации вакансии', str(i), True)
-            if len(fields) != 0:
-                self.set_value_dicts(self.salary_years, self.count_years, i, fields)
-                fields = self.filter_vacancies(fields, 'Название', self.prof_name)
-                self.set_value_dicts(self.salary_prof, self.count_prof, i, fields)
+        years = vacancies['year'].to_numpy()
+        in_range = (2007 <= years) & (years <= 2022)
+        codes = years[in_range].astype(np.intp) - 2007
+        salaries = vacancies['salary_avg_rub'].to_numpy()[in_range]
+        with_name = self.get_name_mask(vacancies, self.prof_name)[in_range]
+        keys = {2007 + int(code): code for code in np.flatnonzero(np.bincount(codes))}
+        self.set_grouped_value_dicts(self.salary_years, self.count_years, keys, salaries, codes)
+        self.set_grouped_value_dicts(self.salary_prof, self.count_prof, keys, salaries[with_name], codes[with_name])
         self.calculate_stats_areas(vacancies)
         return {"salary_years": self.salary_years, "count_years": self.count_years,
                 "areas_with_salrs": self.areas_with_salrs,
                 "salary_prof": self.salary_prof, "count_prof": self.count_prof,
                 "areas_with_shares": self.areas_with_shares, }
 
-    def set_value_dicts(self, dic_salary, dic_count, key, vacancies):
-        """Вычисляет статистику по годам и заполняет ей словари
+    def set_grouped_value_dicts(self, dic_salary, dic_count, keys, salaries, codes):
+        """Вычисляет статистику сразу по всем группам и заполняет ей словари
 
         Args:
-            dic_salary (dict): Словарь с зарплатами по годам
-            dic_count (dict): Словарь с количеством вакансий по годам
-            key (str or int): Ключ, по которому будут заполняться словари
-            vacancies (list): Список вакансий, по которым будет вычисляться статистика
+            dic_salary (dict): Словарь с зарплатами по группам
+            dic_count (dict): Словарь с количеством вакансий по группам
+            keys (dict): Ключи, по которым будут заполняться словари, и номера их групп
+            salaries (ndarray): Средние зарплаты вакансий в рублях
+            codes (ndarray): Номер группы каждой вакансии
         """
-        dic_salary[key] = self.get_avg_salary(vacancies)
-        dic_count[key] = len(vacancies)
+        size = max(keys.values(), default=-1) + 1
+        sums = np.bincount(codes, weights=salaries, minlength=size)
+        counts = np.bincount(codes, minlength=size)
+        for key, code in keys.items():
+            count = int(counts[code])
+            dic_salary[key] = int(sums[code] / count) if count != 0 else 0
+            dic_count[key] = count
 
     def calculate_stats_by_multiprocess(self, vacancies, directory, prof_name):
         """Формирует статистики по годам и по городам, используя multiprocessing
 
         Args:
-            vacancies (list): Вакансии для формирования статистики
+            vacancies (DataFrame or iterable): Вакансии или части файла с вакансиями для формирования статистики
             directory (str): Директория, в которой содержаться csv файлы с вакансиями
             prof_name (str): Название Профессии для формирования статистики
 
@@ -574,14 +803,16 @@ class DataStats:
         """
         self.directory = directory
         self.prof_name = prof_name
+        vacancies = self.get_started_frames(vacancies)
         pool = multiprocessing.Pool(16)
-        for i, res in enumerate(pool.map(self.calculate_stats_year, [str(i) for i in range(2007, 2023)])):
+        results = pool.map_async(self.get_year_worker().calculate_stats_year, [str(i) for i in range(2007, 2023)])
+        self.calculate_stats_areas(vacancies)
+        for i, res in enumerate(results.get()):
             year = i + 2007
             self.salary_years[year] = res['avg_salary']
             self.salary_prof[year] = res['avg_salary_prof']
             self.count_years[year] = res['count']
             self.count_prof[year] = res['count_prof']
-        self.calculate_stats_areas(vacancies)
         return {"salary_years": self.salary_years, "count_years": self.count_years,
                 "areas_with_salrs": self.areas_with_salrs,
                 "salary_prof": self.salary_prof, "count_prof": self.count_prof,
@@ -591,7 +822,7 @@ class DataStats:
         """Формирует статистики по годам и по городам, используя concurrent.futures
 
         Args:
-            vacancies (list): Вакансии для формирования статистики
+            vacancies (DataFrame or iterable): Вакансии или части файла с вакансиями для формирования статистики
             directory (str): Директория, в которой содержаться csv файлы с вакансиями
             prof_name (str): Название Профессии для формирования статистики
 
@@ -600,20 +831,53 @@ class DataStats:
         """
         self.directory = directory
         self.prof_name = prof_name
+        vacancies = self.get_started_frames(vacancies)
         with ProcessPoolExecutor(16) as executer:
-            results = executer.map(self.calculate_stats_year, [str(i) for i in range(2007, 2023)])
-        for i, res in enumerate(list(results)):
+            results = executer.map(self.get_year_worker().calculate_stats_year, [str(i) for i in range(2007, 2023)])
+            self.calculate_stats_areas(vacancies)
+            results = list(results)
+        for i, res in enumerate(results):
             year = i + 2007
             self.salary_years[year] = res['avg_salary']
             self.salary_prof[year] = res['avg_salary_prof']
             self.count_years[year] = res['count']
             self.count_prof[year] = res['count_prof']
-        self.calculate_stats_areas(vacancies)
         return {"salary_years": self.salary_years, "count_years": self.count_years,
                 "areas_with_salrs": self.areas_with_salrs,
                 "salary_prof": self.salary_prof, "count_prof": self.count_prof,
                 "areas_with_shares": self.areas_with_shares, }
 
+    def get_started_frames(self, vacancies):
+        """Считывает части файла до первой непустой, чтобы пустой файл или файл без данных завершал программу
+        до запуска процессов по годам
+
+        Args:
+            vacancies (DataFrame or iterable): Вакансии или части файла с вакансиями
+
+        Returns:
+            DataFrame or iterable: Те же вакансии, уже считанные части возвращаются первыми
+        """
+        if isinstance(vacancies, pd.DataFrame):
+            return vacancies
+        frames = iter(vacancies)
+        started = []
+        for frame in frames:
+            started.append(frame)
+            if len(frame) != 0:
+                break
+        return itertools.chain(started, frames)
+
+    def get_year_worker(self):
+        """Создает копию с настройками статистики для дочерних процессов, чтобы статистику по городам можно было
+        считать в основном процессе, пока они читают файлы по годам
+
+        Returns:
+            DataStats: Объект только с директорией и названием профессии
+        """
+        worker = DataStats()
+        worker.directory, worker.prof_name = self.directory, self.prof_name
+        return worker
+
     def calculate_stats_year(self, year):
         """Формирует статистику вакансий по заданному году, считывая нужный файл
 
@@ -623,30 +887,36 @@ class DataStats:
         Returns:
             dict: Словарь со татистикой
         """
-        vacancies = DataSet().csv_parse(f'{self.directory}/{year}.csv')
-        vacancies_with_name = self.filter_vacancies(vacancies, "Название", self.prof_name)
-        return {'avg_salary': self.get_avg_salary(vacancies),
-                'avg_salary_prof': self.get_avg_salary(vacancies_with_name),
-                'count': len(vacancies),
-                'count_prof': len(vacancies_with_name)}
+        vacancies = DataSet().csv_parse_frame(f'{self.directory}/{year}.csv')
+        salaries = vacancies['salary_avg_rub'].to_numpy()
+        with_name = self.get_name_mask(vacancies, self.prof_name)
+        salaries_with_name = salaries[with_name]
+        return {'avg_salary': int(salaries.sum() / len(salaries)) if len(salaries) != 0 else 0,
+                'avg_salary_prof': int(salaries_with_name.sum() / len(salaries_with_name))
+                if len(salaries_with_name) != 0 else 0,
+                'count': len(salaries),
+                'count_prof': len(salaries_with_name)}
 
     def calculate_stats_areas(self, vacancies):
         """Вычисляет статистику по городам и заполняет ей атрибуты класса
 
         Args:
-            vacancies (list): Список вакансий, по которым будет вычисляться статистика
+            vacancies (DataFrame or iterable): Вакансии или части файла с вакансиями (DataSet.iter_csv_frames),
+                по которым будет вычисляться статистика
         """
-        dic_areas = {}
-        for vacancy in vacancies:
-            if vacancy.area_name not in dic_areas:
-                dic_areas[vacancy.area_name] = 0
-            dic_areas[vacancy.area_name] += 1
-        areas = [area for area in dic_areas if dic_areas[area] / len(vacancies) >= 0.01][:10]
-        for area in areas:
-            fields = self.filter_vacancies(vacancies, 'Название региона', area)
-            self.set_value_dicts(self.areas_with_salrs, self.areas_with_shares, area, fields)
-            self.areas_with_shares = {area: float(format(dic_areas[area] / len(vacancies), '.4f')) for area
-                                      in self.areas_with_shares}
+        frames = [vacancies] if isinstance(vacancies, pd.DataFrame) else vacancies
+        counts, sums, total = {}, {}, 0
+        for frame in frames:
+            codes, areas = pd.factorize(frame['area_name'])
+            frame_counts = np.bincount(codes, minlength=len(areas)).tolist()
+            frame_sums = np.bincount(codes, weights=frame['salary_avg_rub'].to_numpy(), minlength=len(areas)).tolist()
+            for area, count, salary_sum in zip(areas, frame_counts, frame_sums):
+                counts[area] = counts.get(area, 0) + count
+                sums[area] = sums.get(area, 0) + salary_sum
+            total += len(frame)
+        for area in [area for area in counts if counts[area] / total >= 0.01][:10]:
+            self.areas_with_salrs[area] = int(sums[area] / counts[area])
+            self.areas_with_shares[area] = float(format(counts[area] / total, '.4f'))
 
         self.areas_with_salrs = Helpers().get_sorted_dic(self.areas_with_salrs, lambda item: item[1])
         self.areas_with_shares = Helpers().get_sorted_dic(self.areas_with_shares, lambda item: item[1])
@@ -655,21 +925,42 @@ class DataStats:
         """Фильтрует вакансии
 
         Args:
-            vacancies (list): вакансии, требующие сортировки
+            vacancies (DataFrame): вакансии, требующие сортировки
             key (str): Ключ, по которому будет производиться фильтрация
             value (int or str): Значение, по которому будет производиться фильтрация
             year_only (bool): Показывает, нужно ли сравнить поле вакансии 'published_at' только по году
 
         Returns:
-            list: Списко отфильтрованных вакансий
+            DataFrame: Отфильтрованные вакансии
+        """
+        if key == 'Название':
+            mask = self.get_name_mask(vacancies, value)
+        elif key == 'Дата публикации вакансии' and year_only:
+            mask = vacancies['year'].to_numpy() == int(value)
+        elif key == 'Оклад':
+            salary = int(value)
+            mask = (vacancies['salary_from'].to_numpy() <= salary) & (salary <= vacancies['salary_to'].to_numpy())
+        else:
+            mask = DataSet.filters[key](lambda column: vacancies[column], value)
+        return vacancies[mask]
+
+    def get_name_mask(self, vacancies, name):
+        """Находит вакансии, в названии которых есть заданная подстрока
+
+        Args:
+            vacancies (DataFrame): Вакансии
+            name (str): Подстрока, которую нужно найти в названии
+
+        Returns:
+            ndarray: Маска вакансий, название которых содержит name
         """
-        return list(filter(lambda v: v.is_suitable(key, value, year_only), vacancies))
+        return np.fromiter((name in value for value in vacancies['name'].to_numpy()), dtype=bool, count=len(vacancies))
 
     def get_avg_salary(self, vacancies):
         """Возвращает среднюю зарплату
 
         Args:
-            vacancies (list): Вакансии, содержащие атрибут зарплаты
+            vacancies (DataFrame): Вакансии, содержащие столбец salary_avg_rub
 
         Returns:
             int: Средняя зарплата в рублях
@@ -678,15 +969,15 @@ class DataStats:
         0
         >>> DataStats().get_avg_salary([])
         0
-        >>> DataStats().get_avg_salary(DataSet().csv_parse('vacancies.csv')[:1])
+        >>> DataStats().get_avg_salary(DataSet().csv_parse_frame('vacancies.csv')[:1])
         90000
-        >>> DataStats().get_avg_salary(DataSet().csv_parse('vacancies.csv'))
+        >>> DataStats().get_avg_salary(DataSet().csv_parse_frame('vacancies.csv'))
         94892
 
         """
         if vacancies is None or len(vacancies) == 0:
             return 0
-        return int(sum([v.salary.get_salary_in_rub() for v in vacancies]) / len(vacancies))
+        return int(vacancies['salary_avg_rub'].sum() / len(vacancies))
 
     def get_all_stats(self):
         """Возвращает всю статистику, сформированную классом
@@ -711,8 +1002,8 @@ class DataStats:
 
 class DataStatsTest(unittest.TestCase):
     def test_calculate_stats(self):
-        vacancies = DataSet().csv_parse("vacancies.csv")
-        vacancies_in_moscow = list(filter(lambda v: v.area_name == "Москва", vacancies))
+        vacancies = DataSet().csv_parse_frame("vacancies.csv")
+        vacancies_in_moscow = vacancies[vacancies['area_name'] == "Москва"]
         data_stats = DataStats()
         data_stats.calculate_stats_areas(vacancies_in_moscow)
         areas_with_salrs, areas_with_shares = data_stats.areas_with_salrs, data_stats.areas_with_shares
@@ -721,7 +1012,7 @@ class DataStatsTest(unittest.TestCase):
 
     def test_filter_vacancies(self):
         data_stats = DataStats()
-        vacancies = DataSet().csv_parse("vacancies.csv")
+        vacancies = DataSet().csv_parse_frame("vacancies.csv")
         filtered_vacancies = data_stats.filter_vacancies(vacancies, "Название региона", "Москва")
         data_stats.calculate_stats_areas(vacancies)
         self.assertEqual(math.ceil(len(vacancies) * data_stats.areas_with_shares['Москва']), len(filtered_vacancies))
@@ -735,14 +1026,41 @@ class DataStatsTest(unittest.TestCase):
         filtered_vacancies = data_stats.filter_vacancies(vacancies, "Дата публикации вакансии", "2022", year_only=True)
         self.assertEqual(len(vacancies), len(filtered_vacancies))
 
+    def test_get_started_frames(self):
+        frames = [pd.DataFrame({"area_name": []}), pd.DataFrame({"area_name": ["Омск"]}),
+                  pd.DataFrame({"area_name": ["Москва"]})]
+        read = []
+        started = DataStats().get_started_frames(read.append(frame) or frame for frame in frames)
+        self.assertEqual(2, len(read))
+        self.assertEqual([id(frame) for frame in frames], [id(frame) for frame in started])
+
+    def test_filter_vacancies_frame(self):
+        data = pd.DataFrame(
+            {"name": ["Главный программист", "Аналитик"], "description": ["Описание", "Описание"],
+             "key_skills": ["Git\nPython", "SQL"], "experience_id": ["between1And3", "noExperience"],
+             "premium": ["True", "False"], "employer_name": ["ООО Компания", "ООО Компания"],
+             "salary_from": ["100.5", "50"], "salary_to": ["200", "99.9"], "salary_gross": ["True", "False"],
+             "salary_currency": ["RUR", "EUR"], "area_name": ["Омск", "Москва"],
+             "published_at": ["2007-12-03T17:34:36+0300", "2022-07-05T18:21:28+0300"]})
+        vacancies = [Vacancy(row) for row in data.to_dict('records')]
+        frame = DataSet().get_stats_frame(data)
+        for key, value in [("Оклад", "100"), ("Оклад", "99"), ("Оклад", "50"), ("Оклад", "200"),
+                           ("Идентификатор валюты оклада", "Рубли"), ("Идентификатор валюты оклада", "Евро"),
+                           ("Опыт работы", "Нет опыта"), ("Премиум-вакансия", "Да"), ("Навыки", "Python"),
+                           ("Название региона", "Москва"), ("Дата публикации вакансии", "05.07.2022")]:
+            filtered_vacancies = DataStats().filter_vacancies(frame, key, value)
+            self.assertEqual([v.name for v in vacancies if v.is_suitable(key, value)],
+                             filtered_vacancies['name'].tolist(), (key, value))
+        self.assertEqual(["Главный программист"], DataStats().filter_vacancies(frame, "Оклад", "100")['name'].tolist())
+
 
 class Report:
     """Класс для формирования отчетов
 
     Attributes:
         book (Workbook): excel книга
-        sheet_cities (Worksheet): лист excel книги со статистикой по годам
-        sheet_years (Worksheet): лист excel книги со статистикой по городам
+        sheet_cities (list): строки листа excel книги со статистикой по городам
+        sheet_years (list): строки листа excel книги со статистикой по годам
         data (dict): словарь со статистикой
     """
 
@@ -759,12 +1077,11 @@ class Report:
 
     def generate_excel(self):
         """Генерирует excel файл и заполняет его данными"""
-        book = Workbook()
+        book = Workbook(write_only=True)
         self.book = book
-        book.remove(book.active)
+        self.stylize_book(book)
         self.sheet_years = self.fill_data_years(book.create_sheet('Статистика по годам'))
         self.sheet_cities = self.fill_data_cities(book.create_sheet('Статистика по городам'))
-        self.stylize_book(book)
         sheet = book.create_sheet("fgfdg")
         book.save('report.xlsx')
         return book
@@ -776,18 +1093,16 @@ class Report:
             sheet (Worksheet): Excel лист
 
         Returns:
-            (Worksheet): заполненный данными excel лист
+            list: Строки, записанные на лист
         """
         sheet_years = [
             ['Год', 'Средняя зарплата', f'Средняя зарплата - {self.data["prof_name"]}', 'Количество вакансий',
              f'Количество вакансий - {self.data["prof_name"]}']]
-        sheet.append(sheet_years[0])
-        years = list(self.data['salary_years'].keys())
-        for i in range(years[0], years[-1] + 1):
-            row = [i, self.data['salary_years'][i], self.data['salary_prof'][i], self.data['count_years'][i],
-                   self.data['count_prof'][i]]
-            sheet.append(row)
-            sheet_years.append(row)
+        salary_prof, count_years, count_prof = (
+            self.data['salary_prof'], self.data['count_years'], self.data['count_prof'])
+        sheet_years += [[year, salary, salary_prof[year], count_years[year], count_prof[year]]
+                        for year, salary in self.data['salary_years'].items()]
+        self.stylize_worksheet(sheet, sheet_years)
         return sheet_years
 
     def fill_data_cities(self, sheet):
@@ -797,22 +1112,16 @@ class Report:
             sheet (Worksheet): Excel лист
 
         Returns:
-            (Worksheet): заполненный данными excel лист
+            list: Строки, записанные на лист
         """
         sheet_cities = [['Город', 'Уровень зарплат', '', 'Город', 'Доля вакансий']]
-        sheet.append(sheet_cities[0])
-        values = []
-        for key, value in self.data['areas_with_salrs'].items():
-            values.append([key, value, ''])
-        for i, (key, value) in enumerate(self.data['areas_with_shares'].items()):
-            values[i] += [key, value]
-        for row in values:
-            sheet.append(row)
-            sheet_cities.append(row)
+        sheet_cities += [[area_salary, salary, '', area_share, share] for (area_salary, salary), (area_share, share)
+                         in zip(self.data['areas_with_salrs'].items(), self.data['areas_with_shares'].items())]
+        self.stylize_worksheet(sheet, sheet_cities, is_percent_value=True, column_index=4)
         return sheet_cities
 
     def stylize_book(self, book):
-        """Стилизует excel книгу
+        """Добавляет в excel книгу именованные стили, которыми оформляются листы
 
         Args:
             book (Workbook): Excel книга
@@ -825,10 +1134,6 @@ class Report:
         percent_style.number_format = BUILTIN_FORMATS[10]
         book.add_named_style(percent_style)
 
-        self.stylize_worksheet(book['Статистика по годам'])
-        self.stylize_worksheet(book['Статистика по городам'], is_percent_value=True, column_index=4)
-        self.make_width_correct(book)
-
     def get_base_style(self, name):
         """Создает именованный стиль и делает его базовую настройку
 
@@ -843,65 +1148,67 @@ class Report:
         style.border = Border(top=side, left=side, right=side, bottom=side)
         return style
 
-    def stylize_worksheet(self, sheet, is_percent_value=False, column_index=-1):
-        """Стилизует excel лист
+    def stylize_worksheet(self, sheet, rows, is_percent_value=False, column_index=-1):
+        """Записывает строки на excel лист, задавая стиль каждой ячейке
 
         Args:
-            sheet (Worksheet): Excel лист
+            sheet (WriteOnlyWorksheet): Excel лист
+            rows (list): Строки листа, первая из них - заголовок
             is_percent_value (bool): Показывает, содержит ли лист столбы с '%'
             column_index (int): Индекс стоблца, содержащего '%'
         """
-        for i, row in enumerate(sheet):
-            for j, cell in enumerate(row):
-                if i == 0:
-                    cell.style = 'bold_style'
-                elif is_percent_value and j == column_index:
-                    cell.style = 'percent_style'
-                else:
-                    cell.style = 'normal_style'
-
-    def make_width_correct(self, workbook):
-        """Задает корректрую ширину всем колонкам книги
+        self.make_width_correct(sheet, rows)
+        column_styles = ['normal_style'] * len(rows[0])
+        if is_percent_value:
+            column_styles[column_index] = 'percent_style'
+        for i, row in enumerate(rows):
+            cells = []
+            for value, style in zip(row, column_styles):
+                cell = WriteOnlyCell(sheet, value=value)
+                cell.style = style if i != 0 else 'bold_style'
+                cells.append(cell)
+            sheet.append(cells)
+
+    def make_width_correct(self, sheet, rows):
+        """Задает корректрую ширину колонкам листа по строкам, которые будут на него записаны
 
         Args:
-            workbook (Workbook): Excel книга
+            sheet (WriteOnlyWorksheet): Excel лист
+            rows (list): Строки листа
         """
-        for worksheet in workbook.worksheets:
-            column_widths = []
-            for row in worksheet:
-                for i, cell in enumerate(row):
-                    len_value = len(cell.value) if isinstance(cell.value, str) else len(str(cell.value))
-                    if len(column_widths) > i:
-                        if len_value > column_widths[i]:
-                            column_widths[i] = len_value
-                    else:
-                        column_widths += [len_value]
-
-            for i, column_width in enumerate(column_widths, 1):
-                worksheet.column_dimensions[get_column_letter(i)].width = column_width + 2
+        column_widths = {}
+        for row in rows:
+            for i, value in enumerate(row, 1):
+                len_value = len(value) if isinstance(value, str) else len(str(value))
+                if len_value > column_widths.get(i, -1):
+                    column_widths[i] = len_value
+
+        for i, column_width in column_widths.items():
+            sheet.column_dimensions[get_column_letter(i)].width = column_width + 2
 
     def generate_image(self):
         """Создает диаграмму и сохраняет её в png файл"""
-        plt.figure()
         plt.rcParams['font.size'] = '8'
+        figure, axes = plt.subplots(2, 2)
 
-        self.get_base_chart('Уровень зарплат по годам', 1, 'средняя з/п', f'з/п {self.data["prof_name"]}',
+        self.get_base_chart(axes[0, 0], 'Уровень зарплат по годам', 'средняя з/п', f'з/п {self.data["prof_name"]}',
                             self.data['salary_years'], self.data['salary_prof'])
-        self.get_base_chart('Количество вакансий по годам', 2, 'Количество вакансий',
+        self.get_base_chart(axes[0, 1], 'Количество вакансий по годам', 'Количество вакансий',
                             f'Количество вакансий {self.data["prof_name"]}', self.data['count_years'],
                             self.data['count_prof'])
-        self.get_barhchart()
-        self.get_piechart()
+        self.get_barhchart(axes[1, 0])
+        self.get_piechart(axes[1, 1])
 
-        plt.tight_layout()
-        plt.savefig('graph.png')
+        figure.tight_layout()
+        figure.savefig('graph.png')
+        plt.close(figure)
 
-    def get_base_chart(self, title, position, label1, label2, data1, data2):
+    def get_base_chart(self, ax, title, label1, label2, data1, data2):
         """Рисует базовую столбчатую диаграмму с двумя графиками
 
         Args:
+            ax (Axes): Область фигуры, на которой рисуется диаграмма
             title (str): Название диаграммы
-            position (int): позиция диаграммы в общей фигуре
             label1 (str): Подписи к первому графику
             label2 (str): Подписи к второму графику
             data1 (dict): Данные для первого графика
@@ -912,43 +1219,49 @@ class Report:
         data1 = list(data1.values())
         data2 = list(data2.values())
         width = 0.4
-        plt.subplot(2, 2, position)
-        plt.title(title)
-        plt.bar(labels_indexes - width / 2, data1, label=label1, width=width)
-        plt.bar(labels_indexes + width / 2, data2, label=label2, width=width)
-        plt.grid(axis='y')
-        plt.xticks(rotation=90)
-        plt.legend()
-
-    def get_barhchart(self):
-        """Рисует перевернутую столбчатую диаграмму"""
-        plt.subplot(2, 2, 3)
-        plt.title('Уровень зарплат по городам')
+        ax.set_title(title)
+        ax.bar(labels_indexes - width / 2, data1, label=label1, width=width)
+        ax.bar(labels_indexes + width / 2, data2, label=label2, width=width)
+        ax.grid(axis='y')
+        ax.tick_params(axis='x', labelrotation=90)
+        ax.legend()
+
+    def get_barhchart(self, ax):
+        """Рисует перевернутую столбчатую диаграмму
+
+        Args:
+            ax (Axes): Область фигуры, на которой рисуется диаграмма
+        """
+        ax.set_title('Уровень зарплат по городам')
         areas = list(map(lambda x: x.replace(' ', ' \n').replace('-', '-\n'), self.data['areas']))
         areas.reverse()
         salaries = list(self.data['areas_with_salrs'].values()).copy()
         salaries.reverse()
-        plt.barh(areas, salaries)
-        plt.tick_params(axis='y', which='major', labelsize=6)
-        plt.grid(axis='x')
+        ax.barh(areas, salaries)
+        ax.tick_params(axis='y', which='major', labelsize=6)
+        ax.grid(axis='x')
 
-    def get_piechart(self):
-        """Рисует квуговую диаграмму"""
-        plt.subplot(2, 2, 4)
+    def get_piechart(self, ax):
+        """Рисует квуговую диаграмму
+
+        Args:
+            ax (Axes): Область фигуры, на которой рисуется диаграмма
+        """
         areas = self.data['areas'].copy()
-        plt.title('Доля вакансий по городам')
+        ax.set_title('Доля вакансий по городам')
         percents = list(self.data['areas_with_shares'].values())
         areas.insert(0, 'Другие')
         percents.insert(0, 1 - sum(percents))
-        plt.pie(percents, labels=areas, textprops={'fontsize': 6})
+        ax.pie(percents, labels=areas, textprops={'fontsize': 6})
 
     def generate_pdf(self):
-        """Генерирует pdf файл, используя excel и png отчеты"""
-        pdf_template = self.create_template()
+        """Генерирует pdf файл, используя excel и png отчеты, через промежуточный html файл report.html"""
+        with open('report.html', 'w', encoding='utf-8') as file:
+            file.write(self.create_template())
         # config = pdfkit.configuration(wkhtmltopdf=r'D:\wkhtmltox\bin\wkhtmltopdf.exe')
         config = pdfkit.configuration(wkhtmltopdf=r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe')
         options = {'enable-local-file-access': None}
-        pdfkit.from_string(pdf_template, 'report.pdf', configuration=config, options=options)
+        pdfkit.from_file('report.html', 'report.pdf', configuration=config, options=options)
 
     def create_template(self):
         """Создает html шаблон pdf файла"""
@@ -972,46 +1285,41 @@ class Report:
         Returns:
             (list): Список названий столбцов и данные
         """
+        rows = {'Статистика по годам': self.sheet_years, 'Статистика по городам': self.sheet_cities}[sheet_name]
+        naming = list(rows[0])
         data = []
-        is_heading = True
-        for row in self.book[sheet_name]:
-            if is_heading:
-                naming = list(map(lambda x: x.value, row))
-                is_heading = False
-            else:
-                row_values = list(map(lambda x: x.value, row))
-                if need_formatting:
-                    row_values[-1] = format(row_values[-1], '.2%')
-                data.append(row_values)
+        for row in rows[1:]:
+            row_values = list(row)
+            if need_formatting:
+                row_values[-1] = format(row_values[-1], '.2%')
+            data.append(row_values)
         return naming, data
 
 
 class Helpers:
-    def filter_vacancies(self, vacancies, key, value):
-        """Фильтрует вакансии по ключу и значению
-
-        Args:
-            vacancies (list): Список вакансий
-            key (str): Ключ, по которому происходит фильтрация
-            value (str or int): Значение для фильтрации
-
-        Returns:
-            list: Отфильтрованные вакансии
-        """
-        return list(filter(lambda v: v.is_suitable(key, value), vacancies))
-
-    def sort_vacancies(self, vacancies, key, reverse):
+    def sort_vacancies(self, vacancies, key, reverse, limit=None):
         """Сортирует вакансии по ключу
 
         Args:
             vacancies (list): Список вакансий
             key (str): Ключ, по которому происходит сортировка
             reverse (bool): Показывает, нужен ли обратный порядок сортировки
+            limit (int): Сколько первых вакансий нужно, остальные отбрасываются. None - оставить все
 
         Returns:
             bool: Отсортированные вакансии
         """
-        vacancies.sort(key=lambda v: v.get_value_for_sort(key), reverse=reverse)
+        if limit is not None:
+            limit = max(limit, 0)
+        if key == 'Оклад':
+            salaries = np.fromiter((v._salary_sort for v in vacancies), dtype=np.float64, count=len(vacancies))
+            order = np.argsort(-salaries if reverse else salaries, kind='stable')
+            vacancies[:] = [vacancies[i] for i in order[:limit]]
+        elif limit is not None and limit < len(vacancies):
+            select = heapq.nlargest if reverse else heapq.nsmallest
+            vacancies[:] = select(limit, vacancies, key=Vacancy.sort_keys[key])
+        else:
+            vacancies.sort(key=Vacancy.sort_keys[key], reverse=reverse)
 
     def get_sorted_dic(self, dic, handler):
         """Сортирует словарь
@@ -1021,10 +1329,9 @@ class Helpers:
             handler (function): Обработчик, по которому сортируется словарь
 
         Returns:
-            dict: Отсортированный словарь
+            dict: Первые 10 элементов отсортированного по убыванию словаря
         """
-        sorted_tuples = sorted(dic.items(), key=handler, reverse=True)
-        return {pair[0]: pair[1] for i, pair in enumerate(sorted_tuples) if i < 10}
+        return dict(heapq.nlargest(10, dic.items(), key=handler))
 
 
 def start_data_to_table():
@@ -1037,14 +1344,14 @@ def start_data_to_table():
         input('Обратный порядок сортировки (Да / Нет): '),
         input('Введите диапазон вывода: ').split(),
         input('Введите требуемые столбцы: ').split(', '))
-    vacancies = DataSet().csv_parse(file_name)
+    vacancies = DataSet().csv_parse(file_name, input_connect.predicate)
     if input_connect.need_filter:
-        vacancies = Helpers().filter_vacancies(vacancies, input_connect.key_filter, input_connect.value_filter)
         if len(vacancies) == 0:
             print('Ничего не найдено')
             sys.exit()
     if input_connect.need_sort:
-        Helpers().sort_vacancies(vacancies, input_connect.key_sort, input_connect.sort_reverse)
+        limit = None if input_connect.end is None else input_connect.end - 1
+        Helpers().sort_vacancies(vacancies, input_connect.key_sort, input_connect.sort_reverse, limit)
 
     input_connect.print_table(vacancies)
 
@@ -1055,7 +1362,7 @@ def start_data_to_stats():
     file_name = input('Введите название файла: ')
     prof_name = input('Введите название профессии: ')
     data_set = DataSet()
-    vacancies = data_set.csv_parse(file_name)
+    vacancies = data_set.iter_csv_frames(file_name)
 
     data_stats = DataStats()
     data_stats.calculate_stats_by_futures(vacancies, directory, prof_name)